@@ -5,14 +5,99 @@ man
 A parser for documents formatted with the man troff macros.
 """
 from dataclasses import dataclass, field
-from textwrap import wrap
-from typing import Iterable, Optional, Sequence
+from functools import lru_cache
+from sys import intern
+from textwrap import TextWrapper
+from typing import Callable, ClassVar, Iterable, Iterator, Optional, Sequence
 
 from blessed import Terminal
+from blessed.sequences import SequenceTextWrapper
+
+
+# Utility functions.
+@lru_cache(maxsize=None)
+def _get_terminal() -> Terminal:
+    """Get the terminal used to style and wrap text."""
+    return Terminal()
+
+
+@lru_cache(maxsize=None)
+def _get_option_templates() -> tuple[str, str]:
+    """Get the templates for styling an option without and with an
+    argument.
+    """
+    term = _get_terminal()
+    name = f'{term.bold}%s{term.normal}'
+    argument = f'{term.underline}%s{term.normal}'
+    return f'[{name}]', f'[{name} {argument}]'
+
+
+@lru_cache(maxsize=None)
+def _get_style_template(style: str) -> str:
+    """Get the template for text in the given terminal style. An
+    empty style only resets the style after the text.
+    """
+    term = _get_terminal()
+    code = getattr(term, style) if style else ''
+    return f'{code}%s{term.normal}'
+
+
+@lru_cache(maxsize=64)
+def _get_wrapper(width: int) -> SequenceTextWrapper:
+    """Get the text wrapper for the given width."""
+    return SequenceTextWrapper(width, _get_terminal())
+
+
+@lru_cache(maxsize=64)
+def _get_plain_wrapper(width: int) -> TextWrapper:
+    """Get the text wrapper for plain text at the given width."""
+    return TextWrapper(width)
+
+
+def _is_plain(line: str, width: int) -> bool:
+    """Whether the line can be wrapped without accounting for
+    terminal sequences or character widths. Words longer than the
+    width are broken differently by the sequence-aware wrapper, so
+    those lines aren't plain either.
+    """
+    if not line.isascii() or '\x1b' in line:
+        return False
+    return max(map(len, line.split())) <= width
+
+
+def _wrap(text: str, width: int) -> list[str]:
+    """Wrap the text to the given width."""
+    lines: list[str] = []
+    for line in text.splitlines():
+        if not line.strip():
+            lines.append('')
+        elif _is_plain(line, width):
+            lines.extend(_get_plain_wrapper(width).wrap(line))
+        else:
+            lines.extend(_get_wrapper(width).wrap(line))
+    return lines
+
+
+@lru_cache(maxsize=4096)
+def _fill(
+    paragraph: str,
+    width: Optional[int],
+    margin: int,
+    indent: int
+) -> str:
+    """Wrap and indent the paragraph for the width, margin, and indent."""
+    wrapped: Sequence[str] = [paragraph,]
+    if width is not None:
+        wrap_width = width - margin - indent
+        wrapped = _wrap(paragraph, wrap_width)
+
+    lead = ' ' * (margin + indent)
+    text = '\n'.join(f'{lead}{line}' for line in wrapped)
+    return f'{text}\n'
 
 
 # Base token classes.
-@dataclass
+@dataclass(slots=True)
 class Token:
     """A superclass for lexical tokens."""
     def process_next(self, line: str) -> bool:
@@ -38,7 +123,7 @@ class Token:
         return text
 
 
-@dataclass
+@dataclass(slots=True)
 class NonPrinting(Token):
 
     def parse(
@@ -51,7 +136,7 @@ class NonPrinting(Token):
         return '', margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Text(Token):
     text: str
 
@@ -59,31 +144,27 @@ class Text(Token):
         return self._parse_escapes(self.text)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlternatingFontStyleToken(Text):
     text: str = ''
 
-    def _alternate_style(self, style_a: str, style_b: str) -> str:
-        term = Terminal()
+    # The terminal styles that alternate between words.
+    styles: ClassVar[tuple[str, str]] = ('', '')
+
+    def __str__(self) -> str:
+        templates = tuple(_get_style_template(style) for style in self.styles)
         words = self.text.split(' ')
-        style = style_a
-        formatteds = []
-        for word in words:
-            formatted = f'{style}{word}{term.normal}'
-            formatteds.append(formatted)
-            if style == style_a:
-                style = style_b
-            else:
-                style = style_a
-        return ' '.join(formatteds)
+        return ' '.join(
+            templates[i % 2] % word for i, word in enumerate(words)
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class MultilineFontStyleToken(Text):
     text: str = ''
 
 
-@dataclass
+@dataclass(slots=True)
 class ContainerToken(Token):
     """A superclass for tokens that contain other tokens."""
     def _parse_contents(
@@ -95,33 +176,22 @@ class ContainerToken(Token):
     ) -> str:
         """Parse the text tokens of the token."""
         # Remove pre-existing hard wrapping.
-        text_like = (Text, Option, EmailAddress, Url)
-        if all(isinstance(token, text_like) for token in contents):
+        if all(isinstance(token, _TEXT_LIKE_TOKENS) for token in contents):
             lines = [token.parse(width)[0].rstrip() for token in contents]
-            paragraph = ' '.join(line for line in lines)
-
-            # Wrap the text for the width, margin, and indent.
-            wrapped = [paragraph,]
-            if width is not None:
-                term = Terminal()
-                wrap_width = width - margin - indent
-                wrapped = term.wrap(paragraph, wrap_width)
-
-            # Add indentation and return.
-            lead = ' ' * (margin + indent)
-            text = '\n'.join(f'{lead}{line}' for line in wrapped)
-            return f'{text}\n'
+            paragraph = ' '.join(line for line in lines if line)
+            return _fill(paragraph, width, margin, indent)
 
         else:
-            text = ''
+            parts = []
             for token in contents:
                 parsed, *_ = token.parse(width, margin, indent)
-                text += parsed
+                parts.append(parsed)
+            text = ''.join(parts)
             return f'{text.rstrip()}\n'
 
 
 # Document structure tokens.
-@dataclass
+@dataclass(slots=True)
 class Example(Token):
     contents: list[Text] = field(default_factory=list)
 
@@ -145,13 +215,13 @@ class Example(Token):
         if width is not None:
             act_width = width - margin - indent
         lead = ' ' * (margin + indent)
-        text = f'{lead}{self.contents[0].text[:act_width]}\n'
-        for token in self.contents[1:]:
-            text = f'{text}{lead}{token.text[:act_width]}\n'
+        text = ''.join(
+            f'{lead}{token.text[:act_width]}\n' for token in self.contents
+        )
         return text, margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class RelativeIndentEnd(NonPrinting):
     indent: str = '1'
 
@@ -164,7 +234,7 @@ class RelativeIndentEnd(NonPrinting):
         return '', margin - int(self.indent), indent
 
 
-@dataclass
+@dataclass(slots=True)
 class RelativeIndentStart(NonPrinting):
     indent: str = '1'
 
@@ -177,7 +247,7 @@ class RelativeIndentStart(NonPrinting):
         return '', margin + int(self.indent), indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Section(ContainerToken):
     heading_text: str = ''
     contents: list[Token] = field(default_factory=list)
@@ -189,7 +259,7 @@ class Section(ContainerToken):
         # If a heading wasn't given as a parameter of the macro, the
         # first line of text after the macro is the heading.
         if not self.heading_text:
-            self.heading_text = stripped
+            self.heading_text = intern(stripped)
             return False
 
         # Weed out blank lines.
@@ -218,14 +288,14 @@ class Section(ContainerToken):
         """Parse the token into text."""
         margin = 0
         indent = 4
-        term = Terminal()
+        term = _get_terminal()
         header = f'{term.bold}{self.heading_text}{term.normal}\n'
         contents = self._parse_contents(self.contents, width, margin, indent)
         text = f'{header}{contents}\n'
         return text, margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Subheading(ContainerToken):
     subheading_text: str = ''
     contents: list[Token] = field(default_factory=list)
@@ -237,7 +307,7 @@ class Subheading(ContainerToken):
         # If a heading wasn't given as a parameter of the macro, the
         # first line of text after the macro is the heading.
         if not self.subheading_text:
-            self.subheading_text = stripped
+            self.subheading_text = intern(stripped)
             return False
 
         # Weed out blank lines.
@@ -266,14 +336,14 @@ class Subheading(ContainerToken):
         """Parse the token into text."""
         margin = 0
         indent = 4
-        term = Terminal()
+        term = _get_terminal()
         head = f'  {term.bold}{self.subheading_text}{term.normal}\n'
         contents = self._parse_contents(self.contents, width, margin, indent)
         text = f'{head}{contents}'
         return f'{text}\n', margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Title(Token):
     title: str
     section: str = ''
@@ -317,7 +387,7 @@ class Title(Token):
 
 
 # Paragraph tokens.
-@dataclass
+@dataclass(slots=True)
 class Paragraph(ContainerToken):
     contents: list[Token] = field(default_factory=list)
 
@@ -346,7 +416,7 @@ class Paragraph(ContainerToken):
         return f'{parsed}\n', margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class IndentedParagraph(ContainerToken):
     tag: str = ''
     indent: str = ''
@@ -356,7 +426,10 @@ class IndentedParagraph(ContainerToken):
         """Process the next line."""
         if not line:
             return False
-        token: Optional[Token] = _process_font_style_macro(line)
+        token: Optional[Token] = _process_font_style_macro(
+            line,
+            self.contents
+        )
         if token:
             self.contents.append(token)
             return False
@@ -389,7 +462,7 @@ class IndentedParagraph(ContainerToken):
         return text, margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class TaggedParagraph(ContainerToken):
     indent: str = ''
     tag: list[str] = field(default_factory=list)
@@ -435,9 +508,7 @@ class TaggedParagraph(ContainerToken):
         # last one.
         parsed_tags = [self._parse_escapes(tag) for tag in self.tag]
         lead = ' ' * margin
-        tags = ''
-        for tag in parsed_tags[:-1]:
-            tags += f'{lead}{tag}\n'
+        tags = ''.join(f'{lead}{tag}\n' for tag in parsed_tags[:-1])
 
         # Add the last or only tag.
         tag = parsed_tags[-1]
@@ -452,45 +523,40 @@ class TaggedParagraph(ContainerToken):
 
 
 # Command synopsis tokens.
-@dataclass
+@dataclass(slots=True)
 class Option(Token):
     option_name: str
     option_argument: str = ''
 
     def __str__(self) -> str:
-        term = Terminal()
+        name_only, with_argument = _get_option_templates()
         if self.option_argument:
-            return (
-                f'[{term.bold}{self.option_name}{term.normal} '
-                f'{term.underline}{self.option_argument}{term.normal}]'
-            )
-        return f'[{term.bold}{self.option_name}{term.normal}]'
+            return with_argument % (self.option_name, self.option_argument)
+        return name_only % self.option_name
 
 
-@dataclass
+@dataclass(slots=True)
 class Synopsis(ContainerToken):
     command: str
     contents: list[Token] = field(default_factory=list)
 
     def process_next(self, line: str) -> bool:
         token: Optional[Token] = None
-        if (
-            is_macro_type(STRUCTURE_TOKENS, line)
-            or is_macro_type(PARAGRAPH_TOKENS, line)
-        ):
+        if _get_macro_name(line) in _BLOCK_MACROS:
             return True
 
         if line.startswith('.YS'):
             pass
 
         elif line.startswith('.OP'):
-            args = line.rstrip().split(' ')
-            token = Option(*args[1:])
+            _, _, args = line.rstrip().partition(' ')
+            name, _, arg = args.partition(' ')
+            token = Option(intern(name), intern(arg))
             self.contents.append(token)
 
         elif line.startswith('.SY'):
-            args = line.rstrip().split(' ')
-            token = Synopsis(args[1])
+            _, _, args = line.rstrip().partition(' ')
+            token = Synopsis(intern(args.partition(' ')[0]))
             self.contents.append(token)
 
         return False
@@ -514,24 +580,26 @@ class Synopsis(ContainerToken):
         margin: int = 0,
         indent: int = 0
     ) -> str:
-        # Split contents into multiple synopses.
+        # Split contents into multiple synopses. New synopses are
+        # built, so parsing doesn't change the lexed tokens.
         synopses = []
         synopsis = Synopsis(self.command)
         for token in self.contents:
             if isinstance(token, Synopsis):
                 synopses.append(synopsis)
-                synopsis = token
+                synopsis = Synopsis(token.command, list(token.contents))
             else:
                 synopsis.contents.append(token)
         else:
             synopses.append(synopsis)
 
         # Get the text for each synopsis, concatenate, and return.
-        text = ''
+        parts = []
         for synopsis in synopses:
             parsed, *_ = synopsis.parse(width, margin, indent)
-            text = f'{text}{parsed.rstrip()}\n'
-        return f'{text}\n'
+            parts.append(f'{parsed.rstrip()}\n')
+        parts.append('\n')
+        return ''.join(parts)
 
     def _parse_single_synopsis(
         self,
@@ -540,7 +608,7 @@ class Synopsis(ContainerToken):
         indent: int = 4
     ) -> str:
         # Build the command label.
-        term = Terminal()
+        term = _get_terminal()
         lead = ' ' * (margin + indent)
         command = f'{lead}{term.bold}{self.command}{term.normal}'
 
@@ -559,7 +627,7 @@ class Synopsis(ContainerToken):
 
 
 # Hyperlink and email tokens.
-@dataclass
+@dataclass(slots=True)
 class EmailAddress(ContainerToken):
     address: str
     contents: list[Token] = field(default_factory=list)
@@ -567,17 +635,12 @@ class EmailAddress(ContainerToken):
 
     def process_next(self, line: str) -> bool:
         """Process the next line."""
-        if (
-            is_macro_type(STRUCTURE_TOKENS, line)
-            or is_macro_type(PARAGRAPH_TOKENS, line)
-            or is_macro_type(COMMAND_SYNOPSIS_TOKENS, line)
-        ):
+        if _get_macro_name(line) in _NON_FONT_MACROS:
             return True
 
         if line.startswith('.ME'):
-            args = line.rstrip().split(' ')
-            if len(args) > 1:
-                self.punctuation = args[1]
+            _, _, args = line.rstrip().partition(' ')
+            self.punctuation = args.partition(' ')[0]
 
         elif line:
             token = Text(line.rstrip())
@@ -592,14 +655,14 @@ class EmailAddress(ContainerToken):
         indent: int = 4
     ) -> tuple[str, int, int]:
         """Parse the token into text."""
-        term = Terminal()
+        term = _get_terminal()
         addr = f'mailto:{self.address}'
         text = self._parse_contents(self.contents, None, 0, 0).rstrip()
         link = term.link(addr, text)
         return f'{link}{self.punctuation}', margin, indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Url(ContainerToken):
     address: str
     contents: list[Token] = field(default_factory=list)
@@ -607,17 +670,12 @@ class Url(ContainerToken):
 
     def process_next(self, line: str) -> bool:
         """Process the next line."""
-        if (
-            is_macro_type(STRUCTURE_TOKENS, line)
-            or is_macro_type(PARAGRAPH_TOKENS, line)
-            or is_macro_type(COMMAND_SYNOPSIS_TOKENS, line)
-        ):
+        if _get_macro_name(line) in _NON_FONT_MACROS:
             return True
 
         if line.startswith('.UE'):
-            args = line.rstrip().split(' ')
-            if len(args) > 1:
-                self.punctuation = args[1]
+            _, _, args = line.rstrip().partition(' ')
+            self.punctuation = args.partition(' ')[0]
 
         elif line:
             token = Text(line.rstrip())
@@ -632,108 +690,100 @@ class Url(ContainerToken):
         indent: int = 4
     ) -> tuple[str, int, int]:
         """Parse the token into text."""
-        term = Terminal()
+        term = _get_terminal()
         text = self._parse_contents(self.contents, None, 0, 0).rstrip()
         link = term.link(self.address, text)
         return f'{link}{self.punctuation}', margin, indent
 
 
 # Font style macros.
-@dataclass
+@dataclass(slots=True)
 class Bold(MultilineFontStyleToken):
     text: str = ''
 
     def __str__(self) -> str:
-        term = Terminal()
-        return f'{term.bold}{self.text}{term.normal}'
+        return _get_style_template('bold') % self.text
 
 
-@dataclass
+@dataclass(slots=True)
 class Italic(MultilineFontStyleToken):
     text: str = ''
 
     def __str__(self) -> str:
-        term = Terminal()
-        return f'{term.underline}{self.text}{term.normal}'
+        return _get_style_template('underline') % self.text
 
 
-@dataclass
+@dataclass(slots=True)
 class Small(MultilineFontStyleToken):
     text: str = ''
 
 
-@dataclass
+@dataclass(slots=True)
 class SmallBold(MultilineFontStyleToken):
     text: str = ''
 
     def __str__(self) -> str:
-        term = Terminal()
-        return f'{term.bold}{self.text}{term.normal}'
+        return _get_style_template('bold') % self.text
 
 
 # Alternating font style macros
-@dataclass
+@dataclass(slots=True)
 class BoldItalic(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style(term.bold, term.underline)
+    styles = ('bold', 'underline')
 
 
-@dataclass
+@dataclass(slots=True)
 class BoldRoman(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style(term.bold, '')
+    styles = ('bold', '')
 
 
-@dataclass
+@dataclass(slots=True)
 class ItalicBold(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style(term.underline, term.bold)
+    styles = ('underline', 'bold')
 
 
-@dataclass
+@dataclass(slots=True)
 class ItalicRoman(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style(term.underline, '')
+    styles = ('underline', '')
 
 
-@dataclass
+@dataclass(slots=True)
 class RomanBold(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style('', term.bold)
+    styles = ('', 'bold')
 
 
-@dataclass
+@dataclass(slots=True)
 class RomanItalic(AlternatingFontStyleToken):
     text: str = ''
-
-    def __str__(self) -> str:
-        term = Terminal()
-        return self._alternate_style('', term.underline)
+    styles = ('', 'underline')
 
 
 # Other tokens.
-@dataclass
+@dataclass(slots=True)
 class Empty(Text):
+    """An unrecognized macro. These are requests like .PD or .IX
+    that change formatting details this parser doesn't support, so
+    they aren't printed.
+    """
     text: str = ''
 
+    def parse(
+        self,
+        width: Optional[int] = None,
+        margin: int = 0,
+        indent: int = 4
+    ) -> tuple[str, int, int]:
+        """Parse the token into text."""
+        return '', margin, indent
+
 
 # Token collections.
-STRUCTURE_TOKENS: dict[str, Optional[type]] = {
+STRUCTURE_TOKENS: dict[str, Optional[type[Token]]] = {
     '.ee': None,
     '.ex': Example,
     '.re': RelativeIndentEnd,
@@ -742,47 +792,79 @@ STRUCTURE_TOKENS: dict[str, Optional[type]] = {
     '.ss': Subheading,
     '.th': Title,
 }
-PARAGRAPH_TOKENS: dict[str, Optional[type]] = {
+PARAGRAPH_TOKENS: dict[str, Optional[type[Token]]] = {
     '.ip': IndentedParagraph,
     '.lp': Paragraph,
     '.p': Paragraph,
     '.pp': Paragraph,
     '.tp': TaggedParagraph,
 }
-COMMAND_SYNOPSIS_TOKENS: dict[str, Optional[type]] = {
+COMMAND_SYNOPSIS_TOKENS: dict[str, Optional[type[Token]]] = {
     '.sy': Synopsis,
     '.op': Option,
     '.ys': None,
 }
+_FONT_STYLE_TOKENS: dict[str, type[Text]] = {
+    'B': Bold,
+    'BI': BoldItalic,
+    'BR': BoldRoman,
+    'I': Italic,
+    'IB': ItalicBold,
+    'IR': ItalicRoman,
+    'RB': RomanBold,
+    'RI': RomanItalic,
+    'SB': SmallBold,
+    'SM': Small,
+}
+_TEXT_LIKE_TOKENS = (Text, Option, EmailAddress, Url)
+_BLOCK_MACROS = frozenset(STRUCTURE_TOKENS) | frozenset(PARAGRAPH_TOKENS)
+_NON_FONT_MACROS = _BLOCK_MACROS | frozenset(COMMAND_SYNOPSIS_TOKENS)
 
 
 # Lexer functions.
-def _build_multiline_font_style_token(
-    class_: type,
-    line: str
-) -> MultilineFontStyleToken:
-    token = class_()
-    if ' ' in line:
-        split_ = line.split(' ', 1)
-        token.text = split_[1]
-    return token
+def _build_font_style_token(line: str) -> Text:
+    """Build the token for a font style macro. If the text to style
+    isn't given on the same line as a multiline font style macro, the
+    token is left empty for the next line to fill.
+    """
+    name, _, text = line[1:].partition(' ')
+    if name in _FONT_STYLE_TOKENS:
+        return _FONT_STYLE_TOKENS[name](text)
+    return Empty(line[1:])
 
 
-def _build_singleline_font_style_token(
-    class_: type,
-    line: str
-) -> Text:
-    split_ = line.split(' ', 1)
-    return class_(split_[1])
+def _split2(args: str) -> tuple[str, str]:
+    """Split the first two space-separated arguments of a macro.
+    Missing arguments are empty, and extra arguments are ignored.
+    """
+    first, _, rest = args.partition(' ')
+    return first, rest.partition(' ')[0]
+
+
+def _split5(args: str) -> tuple[str, str, str, str, str]:
+    """Split the first five space-separated arguments of a macro.
+    Missing arguments are empty, and extra arguments are ignored.
+    """
+    first, _, rest = args.partition(' ')
+    second, _, rest = rest.partition(' ')
+    third, _, rest = rest.partition(' ')
+    fourth, _, rest = rest.partition(' ')
+    return first, second, third, fourth, rest.partition(' ')[0]
+
+
+def _get_macro_name(line: str) -> str:
+    """Get the casefolded macro name, including the period, from the
+    given line. Lines that aren't macros return an empty string.
+    """
+    if not line.startswith('.'):
+        return ''
+    return line.partition(' ')[0].rstrip().casefold()
 
 
 def is_macro_type(macros: Iterable[str], line: str) -> bool:
     """Does the given line match a non-font style macro."""
-    for macro in macros:
-        folded = line.casefold()
-        if folded.startswith(macro.casefold()):
-            return True
-    return False
+    folded = line.casefold()
+    return any(folded.startswith(macro.casefold()) for macro in macros)
 
 
 def _process_font_style_macro(
@@ -794,165 +876,165 @@ def _process_font_style_macro(
     """
     token: Optional[Token] = None
     stripped = line.rstrip()
-    if (
-        is_macro_type(STRUCTURE_TOKENS, stripped)
-        or is_macro_type(PARAGRAPH_TOKENS, stripped)
-        or is_macro_type(COMMAND_SYNOPSIS_TOKENS, stripped)
-    ):
+    if _get_macro_name(stripped) in _NON_FONT_MACROS:
         pass
+    elif stripped.startswith('.'):
+        token = _build_font_style_token(stripped)
     elif (
-        not stripped.startswith('.')
-        and contents
-        and isinstance(contents[-1], Text)
+        contents
+        and isinstance(contents[-1], MultilineFontStyleToken)
         and not contents[-1].text
     ):
         token = contents.pop()
         if isinstance(token, MultilineFontStyleToken):
             token.text = stripped
-    elif not stripped.startswith('.'):
-        token = Text(stripped)
-    elif stripped.startswith('.BI'):
-        token = _build_singleline_font_style_token(BoldItalic, stripped)
-    elif stripped.startswith('.BR'):
-        token = _build_singleline_font_style_token(BoldRoman, stripped)
-    elif stripped.startswith('.B'):
-        token = _build_multiline_font_style_token(Bold, stripped)
-    elif stripped.startswith('.IB'):
-        token = _build_singleline_font_style_token(ItalicBold, stripped)
-    elif stripped.startswith('.IR'):
-        token = _build_singleline_font_style_token(ItalicRoman, stripped)
-    elif stripped.startswith('.I'):
-        token = _build_multiline_font_style_token(Italic, stripped)
-    elif stripped.startswith('.RB'):
-        token = _build_singleline_font_style_token(RomanBold, stripped)
-    elif stripped.startswith('.RI'):
-        token = _build_singleline_font_style_token(RomanItalic, stripped)
-    elif stripped.startswith('.SB'):
-        token = _build_multiline_font_style_token(SmallBold, stripped)
-    elif stripped.startswith('.SM'):
-        token = _build_multiline_font_style_token(Small, stripped)
     else:
-        token = Empty(stripped[1:])
+        token = Text(stripped)
     return token
 
 
-def lex(text: str) -> tuple[Token, ...]:
-    """Lex the given document."""
-    lines = text.split('\n')
-    tokens: list[Token] = []
-    state: Optional[Token] = None
-    buffer = ''
-    for line in lines:
-        token: Optional[Token] = None
+# Macro lexers.
+# Macro arguments like indents and section headings repeat many times
+# in a page and across pages, so they are interned.
+def _lex_example(args: str) -> Token:
+    return Example()
 
-        # Handle multiline macros.
-        if state:
-            if state.process_next(line):
-                tokens.append(state)
-                state = None
 
-        # Determine the relevant macro for the line and create
-        # the token for that macro.
-        if state:
-            pass
+def _lex_example_end(args: str) -> None:
+    return None
 
-        elif line.startswith('.EE'):
-            token = None
 
-        elif line.startswith('.EX'):
-            state = Example()
+def _lex_indented_paragraph(args: str) -> Token:
+    tag, indent = _split2(args.rstrip())
+    return IndentedParagraph(intern(tag), intern(indent))
 
-        elif line.startswith('.IP'):
-            args = line.rstrip().split(' ')
-            if len(args) == 2:
-                state = IndentedParagraph(args[1])
-            elif len(args) > 2:
-                state = IndentedParagraph(args[1], args[2])
-            else:
-                state = IndentedParagraph()
-
-        elif line.startswith('.MT'):
-            args = line.split(' ')
-            state = EmailAddress(args[1])
-
-        elif (
-            line.startswith('.P')
-            or line.startswith('.LP')
-            or line.startswith('.PP')
-        ):
-            state = Paragraph()
-
-        elif line.startswith('.RE'):
-            args = line.split(' ')
-            if args[1:]:
-                token = RelativeIndentEnd(args[1])
-            else:
-                token = RelativeIndentEnd()
 
-        elif line.startswith('.RS'):
-            args = line.split(' ')
-            if args[1:]:
-                token = RelativeIndentStart(args[1])
-            else:
-                token = RelativeIndentStart()
+def _lex_email_address(args: str) -> Token:
+    return EmailAddress(args.partition(' ')[0])
 
-        elif line.startswith('.SH'):
-            args = line.split(' ', 1)
-            if len(args) > 1:
-                state = Section(args[1])
-            else:
-                state = Section()
 
-        elif line.startswith('.SS'):
-            args = line.split(' ', 1)
-            if len(args) > 1:
-                state = Subheading(args[1])
-            else:
-                state = Subheading()
+def _lex_paragraph(args: str) -> Token:
+    return Paragraph()
+
+
+def _lex_relative_indent_end(args: str) -> Token:
+    if args:
+        return RelativeIndentEnd(intern(args.partition(' ')[0]))
+    return RelativeIndentEnd()
+
+
+def _lex_relative_indent_start(args: str) -> Token:
+    if args:
+        return RelativeIndentStart(intern(args.partition(' ')[0]))
+    return RelativeIndentStart()
+
+
+def _lex_section(args: str) -> Token:
+    return Section(intern(args))
 
-        elif line.startswith('.SY'):
-            args = line.split(' ')
-            state = Synopsis(args[1])
-
-        elif line.startswith('.TH'):
-            args = line.split(' ')
-            token = Title(*args[1:])
-
-        elif line.startswith('.TP'):
-            args = line.rstrip().split(' ')
-            if len(args) == 2:
-                state = TaggedParagraph(args[1])
-            elif len(args) > 2:
-                state = TaggedParagraph(args[1], [args[2],])
-            else:
-                state = TaggedParagraph()
 
-        elif line.startswith('.UR'):
-            args = line.split(' ')
-            state = Url(args[1])
+def _lex_subheading(args: str) -> Token:
+    return Subheading(intern(args))
 
-        elif line.startswith('.'):
-            token = Empty(line[1:])
+
+def _lex_synopsis(args: str) -> Token:
+    return Synopsis(intern(args.partition(' ')[0]))
+
+
+def _lex_title(args: str) -> Token:
+    return Title(*(intern(arg) for arg in _split5(args)))
+
+
+def _lex_tagged_paragraph(args: str) -> Token:
+    indent, tag = _split2(args.rstrip())
+    if tag:
+        return TaggedParagraph(intern(indent), [intern(tag),])
+    return TaggedParagraph(intern(indent))
+
+
+def _lex_url(args: str) -> Token:
+    return Url(args.partition(' ')[0])
+
+
+_MACRO_LEXERS: dict[str, Callable[[str], Optional[Token]]] = {
+    'EE': _lex_example_end,
+    'EX': _lex_example,
+    'IP': _lex_indented_paragraph,
+    'LP': _lex_paragraph,
+    'MT': _lex_email_address,
+    'P': _lex_paragraph,
+    'PP': _lex_paragraph,
+    'RE': _lex_relative_indent_end,
+    'RS': _lex_relative_indent_start,
+    'SH': _lex_section,
+    'SS': _lex_subheading,
+    'SY': _lex_synopsis,
+    'TH': _lex_title,
+    'TP': _lex_tagged_paragraph,
+    'UR': _lex_url,
+}
+_STRIP_CARRIAGE_RETURNS = str.maketrans('', '', '\r')
+_MULTILINE_MACROS = frozenset((
+    'EX', 'IP', 'LP', 'MT', 'P', 'PP', 'SH', 'SS', 'SY', 'TP', 'UR',
+))
+
+
+def _consume_lines(token: Token, lines: Sequence[str], i: int) -> int:
+    """Feed lines to a multiline token until the token is closed.
+    Return the index of the line that closed the token.
+    """
+    length = len(lines)
+    while i < length and not token.process_next(lines[i]):
+        i += 1
+    return i
+
+
+def lex(text: str) -> tuple[Token, ...]:
+    """Lex the given document."""
+    return tuple(lex_iter(text))
+
+
+@lru_cache(maxsize=8)
+def _lex_cached(text: str) -> tuple[Token, ...]:
+    """Lex the given document, reusing the tokens of earlier calls."""
+    return lex(text)
+
+
+def lex_iter(text: str) -> Iterator[Token]:
+    """Lex the given document, yielding each token as it closes."""
+    lines = text.translate(_STRIP_CARRIAGE_RETURNS).split('\n')
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        token: Optional[Token] = None
+
+        # Determine the relevant macro for the line and create
+        # the token for that macro. Multiline macros consume lines
+        # until they close, and the line that closes them is then
+        # lexed on its own.
+        if line.startswith('.'):
+            name, _, args = line[1:].partition(' ')
+            lexer = _MACRO_LEXERS.get(name)
+            if lexer:
+                token = lexer(args)
+                if token and name in _MULTILINE_MACROS:
+                    i = _consume_lines(token, lines, i)
+            else:
+                token = _build_font_style_token(line.rstrip())
 
         elif line:
             token = Text(line.rstrip())
 
-        # Add the token to the lexed document.
+        # Yield the token to the caller.
         if token:
-            tokens.append(token)
-
-    else:
-        if state:
-            tokens.append(state)
-            state = None
-
-    return tuple(tokens)
+            yield token
 
 
 # Parsing.
-def parse(tokens: Sequence[Token], width: Optional[int] = 80) -> str:
+def parse(tokens: Iterable[Token], width: Optional[int] = 80) -> str:
     """Parse the tokens into a string."""
-    text = ''
+    parts = []
     footer = ''
     margin = 0
     indent = 4
@@ -961,16 +1043,16 @@ def parse(tokens: Sequence[Token], width: Optional[int] = 80) -> str:
         if isinstance(token, Title):
             footer = token.footer(width)
         parsed, margin, indent = token.parse(width, margin, indent)
-        text += parsed
+        parts.append(parsed)
 
     if footer:
-        text = f'{text}{footer}'
+        parts.append(footer)
 
-    return text
+    return ''.join(parts)
 
 
 # Main line.
 def main(text: str, width: Optional[int]) -> str:
     """Parse man-style macros."""
-    tokens = lex(text)
+    tokens = _lex_cached(text)
     return parse(tokens, width)
@@ -11,39 +11,38 @@ from clireader import man
 
 
 class DocumentTestCase(ut.TestCase):
-    def setUp(self):
-        self.width = 24
-
-        self.bold = '\x1b[1m'
-        self.link = '\x1b]8'
-        self.nml = '\x1b(B\x1b[m'
-        self.st = '\x1b\\'
-        self.udln = '\x1b[4m'
-
-        self.indent_exp_base = (
-            '        This paragraph\n'
-            '        is indented.\n'
-            '\n'
-            '        This one proves\n'
-            '        the indentation\n'
-            '        persists.\n'
-            '\n'
-        )
-        self.indent_exp_outdent = (
-            '    The indentation is\n'
-            '    removed.\n'
-            '\n'
-            '    The indentation is\n'
-            '    still removed.\n'
-            '\n'
-        )
-        self.indent_doc_base = (
-            '.RS 4\n'
-            '.P\n'
-            'This paragraph is indented.\n'
-            '.P\n'
-            'This one proves the indentation persists.\n'
-        )
+    width = 24
+
+    bold = '\x1b[1m'
+    link = '\x1b]8'
+    nml = '\x1b(B\x1b[m'
+    st = '\x1b\\'
+    udln = '\x1b[4m'
+
+    indent_exp_base = (
+        '        This paragraph\n'
+        '        is indented.\n'
+        '\n'
+        '        This one proves\n'
+        '        the indentation\n'
+        '        persists.\n'
+        '\n'
+    )
+    indent_exp_outdent = (
+        '    The indentation is\n'
+        '    removed.\n'
+        '\n'
+        '    The indentation is\n'
+        '    still removed.\n'
+        '\n'
+    )
+    indent_doc_base = (
+        '.RS 4\n'
+        '.P\n'
+        'This paragraph is indented.\n'
+        '.P\n'
+        'This one proves the indentation persists.\n'
+    )
 
     def main_test(self, exp, doc):
         """Determine if the given document returns the expected text."""
@@ -155,6 +154,83 @@ class DocumentTestCase(ut.TestCase):
         )
         self.main_test(exp, doc)
 
+    # Caching tests.
+    def test_main_reuses_lexed_tokens(self):
+        """When the same document is parsed again, such as when it
+        is reflowed to a new width, main should not lex it again.
+        """
+        doc = '.SH SPAM\nmain reuses lexed tokens\n'
+        with patch('clireader.man.lex_iter', wraps=man.lex_iter) as mock:
+            man.main(doc, self.width)
+            man.main(doc, self.width + 10)
+        self.assertEqual(1, mock.call_count)
+
+    def test_lex_returns_new_tokens(self):
+        """When called again with the same text, lex should return
+        new tokens, so changing them doesn't affect later calls.
+        """
+        text = '.SH SPAM\neggs\n'
+        first = man.lex(text)
+        second = man.lex(text)
+        self.assertEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+
+    # Unrecognized macro tests.
+    def test_bold_after_rs(self):
+        """A bold macro (.B) outside of a paragraph, such as after a
+        relative indent start macro (.RS), should print its text in
+        bold.
+        """
+        exp = (
+            f'{self.bold}NAME{self.nml}\n'
+            '    spam\n'
+            '\n'
+            f'{self.bold}important{self.nml}'
+        )
+        doc = (
+            '.SH NAME\n'
+            'spam\n'
+            '.RS\n'
+            '.B important\n'
+            '.RE\n'
+        )
+        self.main_test(exp, doc)
+
+    def test_pd_in_paragraph(self):
+        """A paragraph distance macro (.PD) inside a paragraph should
+        neither close the paragraph nor be printed.
+        """
+        exp = (
+            '    This paragraph keeps\n'
+            '    going.\n'
+            '\n'
+        )
+        doc = (
+            '.P\n'
+            'This paragraph\n'
+            '.PD 0\n'
+            'keeps going.\n'
+        )
+        self.main_test(exp, doc)
+
+    def test_unrecognized_macro_in_tagged_paragraph(self):
+        """An unrecognized macro inside a tagged paragraph, like the
+        .IX index entries pod2man emits, should not be printed.
+        """
+        exp = (
+            'Spam    Do a thing. More\n'
+            '        text.\n'
+            '\n'
+        )
+        doc = (
+            '.TP 8\n'
+            'Spam\n'
+            'Do a thing.\n'
+            '.IX Item "-s"\n'
+            'More text.\n'
+        )
+        self.main_test(exp, doc)
+
 
 class LexTestCase(ut.TestCase):
     def lex_test(self, exp, text):
@@ -319,6 +395,16 @@ class LexTestCase(ut.TestCase):
         )
         self.lex_test(exp, text)
 
+    def test_title_with_extra_parameters(self):
+        """When encountering a title header macro (.TH) with more than
+        five parameters, the Lexer should ignore the extra parameters.
+        """
+        exp = (
+            man.Title('spam', '1', 'eggs', 'bacon', 'ham'),
+        )
+        text = '.TH spam 1 eggs bacon ham tomato'
+        self.lex_test(exp, text)
+
     # Paragraph macros.
     def test_indented_paragraph(self):
         """When encountering an indented paragraph macro (.IP), the
@@ -344,6 +430,32 @@ class LexTestCase(ut.TestCase):
         )
         self.lex_test(exp, text)
 
+    def test_indented_paragraph_with_bold_param_in_next_line(self):
+        """When encountering a bold macro (.B) with its parameter on
+        the next line while collecting lines for an indented paragraph
+        macro (.IP), the lexer should add a Bold token with that text
+        to the IndentedParagraph token.
+        """
+        exp = (
+            man.IndentedParagraph(
+                'spam',
+                '1',
+                [
+                    man.Text('eggs'),
+                    man.Bold('tomato'),
+                    man.Text('bacon ham'),
+                ],
+            ),
+        )
+        text = (
+            f'.IP {exp[0].tag} {exp[0].indent}\n'
+            f'{exp[0].contents[0].text}\n'
+            '.B\n'
+            f'{exp[0].contents[1].text}\n'
+            f'{exp[0].contents[2].text}\n'
+        )
+        self.lex_test(exp, text)
+
     def test_paragraph(self):
         """When encountering a paragraph macro (.P), the Lexer
         should begin collecting the following lines into a token then
@@ -370,7 +482,7 @@ class LexTestCase(ut.TestCase):
             man.Text('bacon ham'),
         ]),)
         text = (
-            '.P\n'
+            '.LP\n'
             f'{exp[0].contents[0].text}\n'
             f'{exp[0].contents[1].text}\n'
         )
@@ -386,7 +498,7 @@ class LexTestCase(ut.TestCase):
             man.Text('bacon ham'),
         ]),)
         text = (
-            '.P\n'
+            '.PP\n'
             f'{exp[0].contents[0].text}\n'
             f'{exp[0].contents[1].text}\n'
         )
@@ -410,6 +522,25 @@ class LexTestCase(ut.TestCase):
         )
         self.lex_test(exp, text)
 
+    def test_tagged_paragraph_with_unrecognized_macro(self):
+        """When encountering an unrecognized macro inside a tagged
+        paragraph (.TP), the Lexer should collect it as an Empty token
+        in the paragraph's contents.
+        """
+        exp = (man.TaggedParagraph('8', ['Spam',], [
+            man.Text('Do a thing.'),
+            man.Empty('IX Item "-s"'),
+            man.Text('More text.'),
+        ]),)
+        text = (
+            '.TP 8\n'
+            'Spam\n'
+            'Do a thing.\n'
+            '.IX Item "-s"\n'
+            'More text.\n'
+        )
+        self.lex_test(exp, text)
+
     def test_tagged_paragraph(self):
         """When encountering a tagged paragraph macro (.TP), the Lexer
         should collect an optional parameter on the same line as the
@@ -855,16 +986,72 @@ class LexTestCase(ut.TestCase):
         )
         self.lex_test(exp, text)
 
+    def test_font_style_outside_paragraph(self):
+        """When encountering a font style macro outside of a
+        paragraph, the lexer should return the token for the font
+        style rather than an Empty token.
+        """
+        exp = (man.Bold('spam'),)
+        text = (
+            '.B spam\n'
+        )
+        self.lex_test(exp, text)
+
+    def test_empty_with_macro_prefix(self):
+        """When encountering a line that starts with a period and a
+        recognized macro name followed by other characters, the lexer
+        should return an Empty token rather than the token for the
+        recognized macro.
+        """
+        exp = (man.Empty('PD 0'),)
+        text = (
+            '.PD 0\n'
+        )
+        self.lex_test(exp, text)
+
+    def test_windows_line_endings(self):
+        """When the document has Windows line endings, the lexer
+        should return the same tokens as with Unix line endings.
+        """
+        exp = (
+            man.Section('SPAM', [man.Text('eggs'),]),
+            man.Paragraph([man.Text('bacon'),]),
+        )
+        text = (
+            '.SH SPAM\r\n'
+            'eggs\r\n'
+            '.P\r\n'
+            'bacon\r\n'
+        )
+        self.lex_test(exp, text)
+
+    # Streaming.
+    def test_lex_iter(self):
+        """When called, lex_iter should yield the same tokens that
+        lex returns.
+        """
+        exp = (
+            man.Section('SPAM', [man.Text('eggs'),]),
+            man.Paragraph([man.Text('bacon'),]),
+        )
+        text = (
+            '.SH SPAM\n'
+            'eggs\n'
+            '.P\n'
+            'bacon\n'
+        )
+        act = man.lex_iter(text)
+        self.assertTupleEqual(exp, tuple(act))
+
 
 class ParseTestCase(ut.TestCase):
-    def setUp(self):
-        self.width = 24
+    width = 24
 
-        self.bold = '\x1b[1m'
-        self.link = '\x1b]8'
-        self.nml = '\x1b(B\x1b[m'
-        self.st = '\x1b\\'
-        self.udln = '\x1b[4m'
+    bold = '\x1b[1m'
+    link = '\x1b]8'
+    nml = '\x1b(B\x1b[m'
+    st = '\x1b\\'
+    udln = '\x1b[4m'
 
     def parse_test(self, exp, tokens):
         """Determine if parsing the given tokens returns the expected
@@ -1045,14 +1232,13 @@ class ParseTestCase(ut.TestCase):
 
 
 class EscapedTextTestCase(ut.TestCase):
-    def setUp(self):
-        self.width = 24
+    width = 24
 
-        self.bold = '\x1b[1m'
-        self.link = '\x1b]8'
-        self.nml = '\x1b(B\x1b[m'
-        self.st = '\x1b\\'
-        self.udln = '\x1b[4m'
+    bold = '\x1b[1m'
+    link = '\x1b]8'
+    nml = '\x1b(B\x1b[m'
+    st = '\x1b\\'
+    udln = '\x1b[4m'
 
     def test_escaped_period(self):
         """A backslash followed by a period should be rendered as a
@@ -1088,14 +1274,16 @@ class EscapedTextTestCase(ut.TestCase):
 
 
 class ParseTokenTestCase(ut.TestCase):
-    def setUp(self):
-        self.width = 24
+    width = 24
+
+    bold = '\x1b[1m'
+    link = '\x1b]8'
+    nml = '\x1b(B\x1b[m'
+    st = '\x1b\\'
+    udln = '\x1b[4m'
 
-        self.bold = '\x1b[1m'
-        self.link = '\x1b]8'
-        self.nml = '\x1b(B\x1b[m'
-        self.st = '\x1b\\'
-        self.udln = '\x1b[4m'
+    command = f'{bold}%s{nml}'
+    option = f'[{bold}%s{nml} {udln}%s{nml}]'
 
     def parse_test(self, exp, token, margin=0, indent=4):
         """Determine if parsing the given tokens returns the expected
@@ -1633,7 +1821,7 @@ class ParseTokenTestCase(ut.TestCase):
         representing the object, a margin, and an indent.
         """
         exp = (
-            f'[{self.bold}-s{self.nml} {self.udln}spam{self.nml}]',
+            self.option % ('-s', 'spam'),
             0,
             4,
         )
@@ -1646,10 +1834,10 @@ class ParseTokenTestCase(ut.TestCase):
         representing the object, a margin, and an indent.
         """
         exp = ((
-            f'{self.bold}spam{self.nml} '
-            f'[{self.bold}-s{self.nml} {self.udln}spam{self.nml}] '
-            f'[{self.bold}-e{self.nml} {self.udln}eggs{self.nml}]\n'
-            f'     [{self.bold}-b{self.nml} {self.udln}bacon{self.nml}]\n'
+            f'{self.command % "spam"} '
+            f'{self.option % ("-s", "spam")} '
+            f'{self.option % ("-e", "eggs")}\n'
+            f'     {self.option % ("-b", "bacon")}\n'
             '\n'
         ), 0, 0)
         token = man.Synopsis('spam', [
@@ -1665,12 +1853,12 @@ class ParseTokenTestCase(ut.TestCase):
         last option of the last command and the next command.
         """
         exp = ((
-            f'{self.bold}spam{self.nml} '
-            f'[{self.bold}-s{self.nml} {self.udln}spam{self.nml}] '
-            f'[{self.bold}-e{self.nml} {self.udln}eggs{self.nml}]\n'
-            f'     [{self.bold}-b{self.nml} {self.udln}bacon{self.nml}]\n'
-            f'{self.bold}ham{self.nml} '
-            f'[{self.bold}-f{self.nml} {self.udln}flapjack{self.nml}]\n'
+            f'{self.command % "spam"} '
+            f'{self.option % ("-s", "spam")} '
+            f'{self.option % ("-e", "eggs")}\n'
+            f'     {self.option % ("-b", "bacon")}\n'
+            f'{self.command % "ham"} '
+            f'{self.option % ("-f", "flapjack")}\n'
             '\n'
         ), 0, 0)
         token = man.Synopsis('spam', [
@@ -1682,6 +1870,18 @@ class ParseTokenTestCase(ut.TestCase):
         ])
         self.parse_test(exp, token, 0, 0)
 
+    def test_synopsis_with_multiple_synopses_parsed_twice(self):
+        """Parsing a Synopsis with multiple commands should not change
+        the token, so parsing it again returns the same string.
+        """
+        token = man.Synopsis('spam', [
+            man.Option('-s', 'spam'),
+            man.Synopsis('ham', []),
+            man.Option('-f', 'flapjack')
+        ])
+        exp = token.parse(self.width, 0, 0)
+        self.parse_test(exp, token, 0, 0)
+
     # Hyperlink and email tokens.
     def test_email_address(self):
         """Given a terminal width, a margin, and an indent,